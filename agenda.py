@@ -0,0 +1,109 @@
+import logging
+import time
+from bisect import insort
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+from database import get_agenda_by_fecha
+
+logger = logging.getLogger(__name__)
+
+# Caché por día: fecha -> (momento de carga, citas ordenadas por (hora, id)).
+# Se actualiza en el mismo proceso al reservar, agendar o eliminar citas; el
+# TTL acota el desfase cuando hay varios procesos escribiendo.
+_agenda_cache: "OrderedDict[date, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+# Versión por día: se incrementa con cada modificación de ese día para
+# descartar las cargas del mismo día que se crucen con ella
+_versions: Dict[date, int] = {}
+# Días con una carga en curso (para eliminaciones de citas fuera de caché)
+_loading: Dict[date, int] = {}
+
+
+def _sort_key(cita: Dict[str, Any]):
+    return (cita["hora"], cita["id"])
+
+
+def _store(fecha: date, citas: List[Dict[str, Any]]) -> None:
+    _agenda_cache[fecha] = (time.monotonic(), citas)
+    _agenda_cache.move_to_end(fecha)
+    while len(_agenda_cache) > settings.AGENDA_CACHE_MAX_DAYS:
+        _agenda_cache.popitem(last=False)
+
+
+async def load_agenda(fecha: date) -> List[Dict[str, Any]]:
+    """
+    Cargar la agenda de un día desde la base de datos y guardarla en caché
+    """
+    version = _versions.get(fecha, 0)
+    _loading[fecha] = _loading.get(fecha, 0) + 1
+    try:
+        citas = await get_agenda_by_fecha(fecha)
+    finally:
+        _loading[fecha] -= 1
+        if not _loading[fecha]:
+            del _loading[fecha]
+    # Si el día cambió durante la consulta, no guardar un resultado posiblemente viejo
+    if _versions.get(fecha, 0) == version:
+        _store(fecha, citas)
+    return list(citas)
+
+
+async def get_agenda(fecha: date) -> List[Dict[str, Any]]:
+    """
+    Agenda de un día (citas con nombre y teléfono del paciente, por hora)
+    """
+    cached = _agenda_cache.get(fecha)
+    if cached is not None and time.monotonic() - cached[0] < settings.AGENDA_CACHE_TTL:
+        _agenda_cache.move_to_end(fecha)
+        return list(cached[1])
+    return await load_agenda(fecha)
+
+
+async def warm_agenda(hoy: Optional[date] = None) -> None:
+    """
+    Precargar la agenda de hoy y de mañana
+    """
+    hoy = hoy or date.today()
+    for fecha in (hoy, hoy + timedelta(days=1)):
+        await load_agenda(fecha)
+    logger.info(f"✅ Agenda precargada para {hoy} y {hoy + timedelta(days=1)}")
+
+
+def _bump(fecha: date) -> None:
+    _versions[fecha] = _versions.get(fecha, 0) + 1
+
+
+def agenda_add(cita: Dict[str, Any], paciente: Dict[str, Any]) -> None:
+    """
+    Agregar una cita recién creada a la agenda en caché de su día
+    """
+    _bump(cita["fecha"])
+    cached = _agenda_cache.get(cita["fecha"])
+    if cached is None:
+        return
+    # Una recarga que terminó después del INSERT ya puede incluir la cita
+    if any(c["id"] == cita["id"] for c in cached[1]):
+        return
+    entrada = {
+        **cita,
+        "nombres": paciente.get("nombres"),
+        "telefono": paciente.get("telefono"),
+    }
+    insort(cached[1], entrada, key=_sort_key)
+
+
+def agenda_remove(cita_id: int) -> None:
+    """
+    Quitar una cita eliminada de la agenda en caché
+    """
+    for fecha, (_, citas) in _agenda_cache.items():
+        for i, cita in enumerate(citas):
+            if cita["id"] == cita_id:
+                del citas[i]
+                _bump(fecha)
+                return
+    # No se sabe su día: invalidar las cargas en curso, que podrían incluirla
+    for fecha in list(_loading):
+        _bump(fecha)
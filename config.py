@@ -28,6 +28,10 @@ class Settings:
     DEFAULT_PAGE_SIZE: int = 100
     MAX_PAGE_SIZE: int = 200
     
+    # Agenda diaria en caché (segundos antes de recargar desde la base de datos)
+    AGENDA_CACHE_TTL: int = int(os.getenv("AGENDA_CACHE_TTL", "60"))
+    AGENDA_CACHE_MAX_DAYS: int = 31
+    
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
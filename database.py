@@ -1,6 +1,7 @@
 import asyncpg
 from databases import Database
 from typing import Optional, Dict, Any, List
+from datetime import date
 import logging
 from config import settings
 
@@ -33,12 +34,24 @@ async def close_client():
     """Cerrar conexión de base de datos"""
     await disconnect_db()
 
-async def get_all_from_table(table_name: str, limit: Optional[int] = None, offset: Optional[int] = None) -> List[Dict[str, Any]]:
+def _select_list(columns: Optional[List[str]]) -> str:
+    """
+    Lista de columnas del SELECT; las columnas deben venir ya validadas
+    contra la lista blanca del modelo (ver fieldsets.py)
+    """
+    return ", ".join(columns) if columns else "*"
+
+async def get_all_from_table(
+    table_name: str,
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
     """
     Obtener todos los registros de una tabla
     """
     try:
-        query = f"SELECT * FROM {table_name}"
+        query = f"SELECT {_select_list(columns)} FROM {table_name}"
         if limit is not None:
             query += f" LIMIT {limit}"
         if offset is not None:
@@ -49,13 +62,60 @@ async def get_all_from_table(table_name: str, limit: Optional[int] = None, offse
         logger.error(f"Error al obtener datos de {table_name}: {e}")
         raise
 
-async def get_by_id(table_name: str, id_field: str, id_value: Any) -> Optional[Dict[str, Any]]:
+def _fecha_conditions(desde: Optional[date], hasta: Optional[date], params: Dict[str, Any]) -> List[str]:
+    """
+    Condiciones de rango sobre `fecha` (ambos extremos inclusive)
+    """
+    conditions = []
+    if desde is not None:
+        conditions.append("fecha >= :desde")
+        params["desde"] = desde
+    if hasta is not None:
+        conditions.append("fecha <= :hasta")
+        params["hasta"] = hasta
+    return conditions
+
+async def get_by_date_range(
+    table_name: str,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    order_by: str = "fecha",
+    limit: Optional[int] = None,
+    offset: Optional[int] = None,
+    columns: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Obtener registros de una tabla filtrando por rango de `fecha`
+    """
+    try:
+        params: Dict[str, Any] = {}
+        conditions = _fecha_conditions(desde, hasta, params)
+        query = f"SELECT {_select_list(columns)} FROM {table_name}"
+        if conditions:
+            query += f" WHERE {' AND '.join(conditions)}"
+        query += f" ORDER BY {order_by}"
+        if limit is not None:
+            query += f" LIMIT {limit}"
+        if offset is not None:
+            query += f" OFFSET {offset}"
+        rows = await database.fetch_all(query, params)
+        return [dict(row) for row in rows]
+    except Exception as e:
+        logger.error(f"Error al obtener datos de {table_name} por rango de fechas: {e}")
+        raise
+
+async def get_by_id(
+    table_name: str,
+    id_field: str,
+    id_value: Any,
+    columns: Optional[List[str]] = None,
+) -> Optional[Dict[str, Any]]:
     """
     Obtener un registro por ID
     """
     try:
         # Usar parámetro nombrado para evitar error de bindparams con lista
-        query = f"SELECT * FROM {table_name} WHERE {id_field} = :id_value"
+        query = f"SELECT {_select_list(columns)} FROM {table_name} WHERE {id_field} = :id_value"
         row = await database.fetch_one(query, {"id_value": id_value})
         return dict(row) if row else None
     except Exception as e:
@@ -206,26 +266,59 @@ async def get_user_by_username(username: str) -> Optional[Dict[str, Any]]:
         logger.error(f"Error al obtener usuario por username: {e}")
         raise
 
-async def get_consultas_by_paciente(cedula_paciente: str) -> List[Dict[str, Any]]:
+async def get_consultas_by_paciente(
+    cedula_paciente: str,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    columns: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
     """
-    Obtener todas las consultas de un paciente
+    Obtener las consultas de un paciente, opcionalmente en un rango de fechas
     """
     try:
-        query = "SELECT * FROM consulta WHERE cedula_paciente = :cedula_paciente"
-        rows = await database.fetch_all(query, {"cedula_paciente": cedula_paciente})
+        params: Dict[str, Any] = {"cedula_paciente": cedula_paciente}
+        conditions = ["cedula_paciente = :cedula_paciente"] + _fecha_conditions(desde, hasta, params)
+        query = f"SELECT {_select_list(columns)} FROM consulta WHERE {' AND '.join(conditions)} ORDER BY fecha"
+        rows = await database.fetch_all(query, params)
         return [dict(row) for row in rows]
     except Exception as e:
         logger.error(f"Error al obtener consultas por paciente: {e}")
         raise
 
-async def get_facturas_by_paciente(cedula_paciente: str) -> List[Dict[str, Any]]:
+async def get_facturas_by_paciente(
+    cedula_paciente: str,
+    desde: Optional[date] = None,
+    hasta: Optional[date] = None,
+    columns: Optional[List[str]] = None,
+) -> List[Dict[str, Any]]:
     """
-    Obtener todas las facturas de un paciente
+    Obtener las facturas de un paciente, opcionalmente en un rango de fechas
     """
     try:
-        query = "SELECT * FROM factura WHERE cedula_paciente = :cedula_paciente"
-        rows = await database.fetch_all(query, {"cedula_paciente": cedula_paciente})
+        params: Dict[str, Any] = {"cedula_paciente": cedula_paciente}
+        conditions = ["cedula_paciente = :cedula_paciente"] + _fecha_conditions(desde, hasta, params)
+        query = f"SELECT {_select_list(columns)} FROM factura WHERE {' AND '.join(conditions)} ORDER BY fecha"
+        rows = await database.fetch_all(query, params)
         return [dict(row) for row in rows]
     except Exception as e:
         logger.error(f"Error al obtener facturas por paciente: {e}")
         raise
+
+async def get_agenda_by_fecha(fecha: date) -> List[Dict[str, Any]]:
+    """
+    Obtener las citas de un día con nombre y teléfono del paciente, ordenadas por hora
+    """
+    try:
+        query = """
+        SELECT c.id, c.fecha, c.hora, c.motivo, c.cedula_paciente, c.agendada_por_medico,
+               p.nombres, p.telefono
+        FROM cita c
+        JOIN paciente p ON p.cedula = c.cedula_paciente
+        WHERE c.fecha = :fecha
+        ORDER BY c.hora, c.id
+        """
+        rows = await database.fetch_all(query, {"fecha": fecha})
+        return [dict(row) for row in rows]
+    except Exception as e:
+        logger.error(f"Error al obtener agenda del {fecha}: {e}")
+        raise
@@ -0,0 +1,69 @@
+# Sparse fieldsets: parámetro ?fields= para leer solo las columnas pedidas
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from fastapi import HTTPException, Query
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter, create_model
+
+
+def allowed_fields(model, schema: Type[BaseModel]) -> List[str]:
+    """Columnas del modelo SQLAlchemy que también expone el esquema de respuesta"""
+    return [name for name in model.__table__.columns.keys() if name in schema.model_fields]
+
+
+def sparse_fields(model, schema: Type[BaseModel]) -> Callable[..., Optional[List[str]]]:
+    """
+    Dependency que valida ?fields=a,b,c contra la lista blanca del modelo.
+
+    Devuelve None si no se pidió `fields` (respuesta completa).
+    """
+    allowed = allowed_fields(model, schema)
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Campos separados por coma. Permitidos: {', '.join(allowed)}",
+        ),
+    ) -> Optional[List[str]]:
+        if fields is None:
+            return None
+        requested = {f.strip() for f in fields.split(",") if f.strip()}
+        if not requested:
+            raise HTTPException(status_code=400, detail="'fields' no puede estar vacío")
+        invalid = sorted(requested.difference(allowed))
+        if invalid:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Campos no permitidos: {', '.join(invalid)}. Permitidos: {', '.join(allowed)}",
+            )
+        # Orden de la lista blanca: cada subconjunto genera un único esquema en caché
+        return [f for f in allowed if f in requested]
+
+    return dependency
+
+
+@lru_cache(maxsize=None)
+def trimmed_schema(schema: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Esquema de respuesta reducido a los campos pedidos"""
+    definitions: Dict[str, Any] = {
+        name: (schema.model_fields[name].annotation, schema.model_fields[name])
+        for name in fields
+    }
+    return create_model(f"{schema.__name__}Parcial", **definitions)
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(schema: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[schema])
+
+
+def sparse_response(data: Any, schema: Type[BaseModel], fields: List[str]) -> Response:
+    """Serializar uno o varios registros con el esquema reducido"""
+    trimmed = trimmed_schema(schema, tuple(fields))
+    if isinstance(data, list):
+        adapter = _list_adapter(trimmed)
+        body = adapter.dump_json(adapter.validate_python(data))
+    else:
+        body = trimmed.model_validate(data).model_dump_json()
+    return Response(content=body, media_type="application/json")
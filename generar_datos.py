@@ -0,0 +1,456 @@
+"""
+Generador de datos clínicos sintéticos para pruebas de escala.
+
+Produce pacientes, citas, consultas, facturas y usuarios coherentes con
+`models.py` y los carga con COPY en varios procesos en paralelo. Cada fila se
+deriva solo de (semilla, tabla, id), por lo que el resultado es idéntico sin
+importar el número de procesos.
+
+Uso:
+    python generar_datos.py --pacientes 10000 --seed 42 --truncate
+    python generar_datos.py --pacientes 5000000 --workers 16 --truncate
+
+Con las proporciones por defecto se generan ~10 filas por paciente
+(1 paciente + 4 citas + 2.8 consultas + 2.5 facturas).
+"""
+import argparse
+import asyncio
+import logging
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import date, time as dtime, timedelta
+from decimal import Decimal
+from typing import Iterator, List, Tuple
+
+import asyncpg
+
+from config import settings
+from database import connect_db, disconnect_db
+from particiones import (
+    PARTITIONED_TABLES,
+    add_months,
+    create_monthly_partition,
+    is_partitioned,
+    month_bounds,
+    months_between,
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+_MASK64 = (1 << 64) - 1
+
+# Identificadores de tabla para separar las secuencias pseudoaleatorias
+_TAG_PACIENTE = 1
+_TAG_CITA = 2
+_TAG_CONSULTA = 3
+_TAG_FACTURA = 4
+
+NOMBRES = [
+    "María", "José", "Luis", "Ana", "Carlos", "Lucía", "Jorge", "Sofía", "Miguel",
+    "Valentina", "Andrés", "Camila", "Diego", "Gabriela", "Fernando", "Daniela",
+    "Juan", "Paola", "Pedro", "Verónica", "Ricardo", "Fernanda", "Santiago", "Elena",
+]
+APELLIDOS = [
+    "García", "Rodríguez", "Pérez", "López", "Sánchez", "Ramírez", "Torres", "Flores",
+    "Vásquez", "Castillo", "Morales", "Ortiz", "Jiménez", "Reyes", "Cruz", "Vega",
+    "Mendoza", "Guerrero", "Andrade", "Zambrano", "Cedeño", "Carrión", "Salazar", "Mora",
+]
+DOMINIOS = ["gmail.com", "hotmail.com", "outlook.com", "yahoo.com"]
+MOTIVOS = [
+    "Control general", "Dolor de cabeza persistente", "Fiebre y malestar",
+    "Dolor abdominal", "Control de presión arterial", "Revisión de exámenes",
+    "Tos y congestión", "Dolor lumbar", "Control de diabetes", "Chequeo anual",
+    "Alergia estacional", "Dolor de garganta", "Seguimiento de tratamiento",
+]
+DIAGNOSTICOS = [
+    "Cefalea tensional", "Infección respiratoria alta", "Gastritis aguda",
+    "Hipertensión arterial controlada", "Lumbalgia mecánica", "Faringitis",
+    "Diabetes mellitus tipo 2", "Rinitis alérgica", "Paciente sano",
+    "Infección de vías urinarias", "Migraña", "Bronquitis aguda",
+]
+TRATAMIENTOS = [
+    "Paracetamol 500 mg cada 8 horas por 3 días", "Ibuprofeno 400 mg cada 8 horas",
+    "Omeprazol 20 mg en ayunas por 14 días", "Losartán 50 mg diario",
+    "Reposo relativo y fisioterapia", "Amoxicilina 500 mg cada 8 horas por 7 días",
+    "Metformina 850 mg con las comidas", "Loratadina 10 mg diario",
+    "Hidratación y dieta blanda", "Sin tratamiento farmacológico",
+]
+OBSERVACIONES = [
+    None, "Control en 15 días", "Solicitar exámenes de laboratorio",
+    "Paciente refiere mejoría", "Referir a especialista", "Control en un mes",
+]
+DESCRIPCIONES_FACTURA = [
+    "Consulta médica general", "Consulta y procedimiento", "Control médico",
+    "Consulta de especialidad", "Consulta y certificado médico",
+]
+
+
+@dataclass(frozen=True)
+class Escala:
+    """Tamaño y parámetros del conjunto de datos a generar"""
+    seed: int
+    pacientes: int
+    citas: int
+    consultas: int
+    facturas: int
+    usuarios: int
+    desde: date
+    dias: int
+    # Días desde `desde` hasta la fecha de generación; solo las citas de ese
+    # tramo (ya atendidas) tienen consulta y factura
+    dias_pasados: int
+
+    @classmethod
+    def from_ratios(
+        cls,
+        seed: int,
+        pacientes: int,
+        citas_por_paciente: float,
+        consultas_por_cita: float,
+        facturas_por_consulta: float,
+        usuarios: int,
+        desde: date,
+        hasta: date,
+        hoy: date,
+    ) -> "Escala":
+        dias = (hasta - desde).days + 1
+        dias_pasados = max(0, min(dias, (hoy - desde).days + 1))
+        citas = int(pacientes * citas_por_paciente)
+        # No hay consultas si todo el rango está en el futuro
+        consultas = min(citas, int(citas * consultas_por_cita)) if dias_pasados else 0
+        facturas = min(consultas, int(consultas * facturas_por_consulta))
+        return cls(
+            seed=seed,
+            pacientes=pacientes,
+            citas=citas,
+            consultas=consultas,
+            facturas=facturas,
+            usuarios=usuarios,
+            desde=desde,
+            dias=dias,
+            dias_pasados=dias_pasados,
+        )
+
+
+def _splitmix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & _MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return x ^ (x >> 31)
+
+
+def _row_hash(escala: Escala, tag: int, row_id: int) -> int:
+    """Valor pseudoaleatorio de 64 bits determinado por (semilla, tabla, id)"""
+    return _splitmix64(_splitmix64(escala.seed * 8 + tag) ^ row_id)
+
+
+def _pick(options: list, h: int):
+    return options[h % len(options)]
+
+
+def _ascii(texto: str) -> str:
+    """Quitar tildes para construir correos"""
+    return unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+
+
+def cedula_for(index: int) -> str:
+    """
+    Cédula ecuatoriana válida y única para el paciente `index` (1..N).
+
+    Provincia (01-24), tercer dígito (0-5), secuencia de 6 dígitos y dígito
+    verificador (módulo 10).
+    """
+    n = index - 1
+    provincia = n % 24 + 1
+    n //= 24
+    tercero = n % 6
+    secuencia = n // 6
+    if secuencia >= 1_000_000:
+        raise ValueError("Demasiados pacientes para generar cédulas únicas")
+    base = f"{provincia:02d}{tercero}{secuencia:06d}"
+    total = 0
+    for i, digito in enumerate(base):
+        valor = int(digito) * (2 if i % 2 == 0 else 1)
+        total += valor - 9 if valor > 9 else valor
+    verificador = (10 - total % 10) % 10
+    return f"{base}{verificador}"
+
+
+def paciente_row(escala: Escala, paciente_id: int) -> Tuple:
+    h = _row_hash(escala, _TAG_PACIENTE, paciente_id)
+    nombre = _pick(NOMBRES, h)
+    apellido1 = _pick(APELLIDOS, h >> 8)
+    apellido2 = _pick(APELLIDOS, h >> 16)
+    correo = None
+    if (h >> 24) % 10 < 8:
+        usuario = _ascii(f"{nombre}.{apellido1}{paciente_id}").lower()
+        correo = f"{usuario}@{_pick(DOMINIOS, h >> 28)}"
+    telefono = f"09{(h >> 32) % 100_000_000:08d}"
+    return (cedula_for(paciente_id), f"{nombre} {apellido1} {apellido2}", correo, telefono)
+
+
+def cita_row(escala: Escala, cita_id: int) -> Tuple:
+    h = _row_hash(escala, _TAG_CITA, cita_id)
+    paciente_id = h % escala.pacientes + 1
+    # Las citas con consulta ya ocurrieron; las demás pueden ser futuras
+    dias = escala.dias_pasados if _has_consulta(escala, cita_id) else escala.dias
+    fecha = escala.desde + timedelta(days=(h >> 24) % dias)
+    slot = (h >> 44) % 20  # 08:00 a 17:30 cada 30 minutos
+    hora = dtime(8 + slot // 2, 30 * (slot % 2))
+    motivo = _pick(MOTIVOS, h >> 50)
+    agendada_por_medico = (h >> 58) % 10 < 4
+    return (cita_id, fecha, hora, motivo, cedula_for(paciente_id), agendada_por_medico)
+
+
+def _spread(index: int, count: int, total: int) -> int:
+    """Asignar el elemento `index` (1..count) a un id único en 1..total"""
+    return (index - 1) * total // count + 1
+
+
+def _has_consulta(escala: Escala, cita_id: int) -> bool:
+    """Indicar si alguna consulta referencia a la cita (inversa de _spread)"""
+    if escala.consultas == 0:
+        return False
+    consulta_id = -(-(cita_id - 1) * escala.consultas // escala.citas) + 1
+    return (
+        consulta_id <= escala.consultas
+        and _spread(consulta_id, escala.consultas, escala.citas) == cita_id
+    )
+
+
+def consulta_row(escala: Escala, consulta_id: int) -> Tuple:
+    cita_id = _spread(consulta_id, escala.consultas, escala.citas)
+    _, fecha, _, _, cedula, _ = cita_row(escala, cita_id)
+    h = _row_hash(escala, _TAG_CONSULTA, consulta_id)
+    return (
+        consulta_id,
+        fecha,
+        _pick(DIAGNOSTICOS, h),
+        _pick(TRATAMIENTOS, h >> 16),
+        _pick(OBSERVACIONES, h >> 32),
+        cedula,
+        cita_id,
+    )
+
+
+def factura_row(escala: Escala, factura_id: int) -> Tuple:
+    consulta_id = _spread(factura_id, escala.facturas, escala.consultas)
+    _, fecha, _, _, _, cedula, _ = consulta_row(escala, consulta_id)
+    h = _row_hash(escala, _TAG_FACTURA, factura_id)
+    valor = Decimal(1500 + h % 23_501) / 100  # 15.00 a 250.00
+    return (factura_id, fecha, valor, _pick(DESCRIPCIONES_FACTURA, h >> 32), cedula, consulta_id)
+
+
+# Columnas en el orden en que se generan las tuplas de cada tabla
+TABLAS = {
+    "paciente": (paciente_row, ["cedula", "nombres", "correo", "telefono"]),
+    "cita": (cita_row, ["id", "fecha", "hora", "motivo", "cedula_paciente", "agendada_por_medico"]),
+    "consulta": (consulta_row, ["id", "fecha", "diagnostico", "tratamiento", "observaciones", "cedula_paciente", "cita_id"]),
+    "factura": (factura_row, ["id", "fecha", "valor", "descripcion", "cedula_paciente", "consulta_id"]),
+}
+
+
+def _rows(escala: Escala, table_name: str, start: int, end: int) -> Iterator[Tuple]:
+    row_fn, _ = TABLAS[table_name]
+    for row_id in range(start, end):
+        yield row_fn(escala, row_id)
+
+
+def _shards(total: int, workers: int) -> List[Tuple[int, int]]:
+    """Dividir los ids 1..total en rangos contiguos [inicio, fin)"""
+    size = max(1, -(-total // workers))
+    return [(start, min(start + size, total + 1)) for start in range(1, total + 1, size)]
+
+
+async def _copy_shard(dsn: str, escala: Escala, table_name: str, start: int, end: int) -> int:
+    _, columns = TABLAS[table_name]
+    conn = await asyncpg.connect(dsn)
+    try:
+        await conn.copy_records_to_table(
+            table_name,
+            records=_rows(escala, table_name, start, end),
+            columns=columns,
+        )
+    finally:
+        await conn.close()
+    return end - start
+
+
+def _copy_shard_process(dsn: str, escala: Escala, table_name: str, start: int, end: int) -> int:
+    """Punto de entrada de cada proceso: un flujo COPY por rango de ids"""
+    return asyncio.run(_copy_shard(dsn, escala, table_name, start, end))
+
+
+# Tablas que se cargan; los ids explícitos solo son válidos si están vacías
+TARGET_TABLES = ("paciente", "cita", "consulta", "factura", "usuario")
+
+
+async def _prepare(conn: asyncpg.Connection, truncate: bool) -> None:
+    if truncate:
+        logger.info("Vaciando tablas...")
+        await conn.execute(
+            "TRUNCATE factura, consulta, cita, paciente, usuario RESTART IDENTITY CASCADE"
+        )
+    ocupadas = [
+        table_name
+        for table_name in TARGET_TABLES
+        if await conn.fetchval(f"SELECT EXISTS (SELECT 1 FROM {table_name})")
+    ]
+    if ocupadas:
+        raise RuntimeError(
+            f"Las tablas {', '.join(ocupadas)} ya tienen datos; use --truncate para vaciarlas"
+        )
+
+
+async def _ensure_partitions(escala: Escala) -> None:
+    """
+    Crear las particiones mensuales que cubren el rango generado, con el
+    mismo helper de la aplicación (mueve filas de DEFAULT si las hubiera)
+    """
+    hasta = escala.desde + timedelta(days=escala.dias - 1)
+    await connect_db()
+    try:
+        for table_name in PARTITIONED_TABLES:
+            if not await is_partitioned(table_name):
+                continue
+            for year, month in months_between(escala.desde, hasta):
+                await create_monthly_partition(table_name, year, month)
+    finally:
+        await disconnect_db()
+
+
+async def _load_usuarios(conn: asyncpg.Connection, escala: Escala, password: str) -> None:
+    from utils import get_password_hash
+
+    password_hash = get_password_hash(password)
+    await conn.copy_records_to_table(
+        "usuario",
+        records=[(f"medico{i:04d}", password_hash) for i in range(1, escala.usuarios + 1)],
+        columns=["username", "password_hash"],
+    )
+
+
+async def _finish(conn: asyncpg.Connection) -> None:
+    # Ajustar las secuencias SERIAL a los ids cargados explícitamente
+    for table_name in PARTITIONED_TABLES:
+        await conn.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), "
+            f"COALESCE((SELECT MAX(id) FROM {table_name}), 0) + 1, false)"
+        )
+    for table_name in ("paciente", "cita", "consulta", "factura", "usuario"):
+        await conn.execute(f"ANALYZE {table_name}")
+
+
+def generate(escala: Escala, workers: int, truncate: bool, password: str) -> None:
+    """Generar y cargar el conjunto de datos completo"""
+    dsn = settings.database_url
+
+    async def prepare():
+        conn = await asyncpg.connect(dsn)
+        try:
+            await _prepare(conn, truncate)
+        finally:
+            await conn.close()
+        await _ensure_partitions(escala)
+        conn = await asyncpg.connect(dsn)
+        try:
+            await _load_usuarios(conn, escala, password)
+        finally:
+            await conn.close()
+
+    asyncio.run(prepare())
+
+    totales = {
+        "paciente": escala.pacientes,
+        "cita": escala.citas,
+        "consulta": escala.consultas,
+        "factura": escala.facturas,
+    }
+    # Las tablas se cargan en orden (claves foráneas); cada tabla en paralelo
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for table_name, total in totales.items():
+            if total == 0:
+                continue
+            inicio = time.perf_counter()
+            futures = [
+                pool.submit(_copy_shard_process, dsn, escala, table_name, start, end)
+                for start, end in _shards(total, workers)
+            ]
+            filas = sum(future.result() for future in futures)
+            segundos = time.perf_counter() - inicio
+            logger.info(
+                f"✅ {table_name}: {filas} filas en {segundos:.1f}s "
+                f"({filas / max(segundos, 1e-9):,.0f} filas/s)"
+            )
+
+    async def finish():
+        conn = await asyncpg.connect(dsn)
+        try:
+            await _finish(conn)
+        finally:
+            await conn.close()
+
+    asyncio.run(finish())
+
+
+def default_hasta(hoy: date) -> date:
+    """Último día del mes siguiente, para que los datos cubran el presente"""
+    year, month = add_months(hoy.year, hoy.month, 1)
+    return month_bounds(year, month)[1] - timedelta(days=1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generar datos clínicos sintéticos")
+    parser.add_argument("--seed", type=int, default=42, help="Semilla (mismo valor, mismos datos)")
+    parser.add_argument("--pacientes", type=int, default=10_000, help="Número de pacientes")
+    parser.add_argument("--citas-por-paciente", type=float, default=4.0)
+    parser.add_argument("--consultas-por-cita", type=float, default=0.7)
+    parser.add_argument("--facturas-por-consulta", type=float, default=0.9)
+    parser.add_argument("--usuarios", type=int, default=20, help="Usuarios del personal médico")
+    parser.add_argument("--password", default="clinica123", help="Contraseña de los usuarios generados")
+    parser.add_argument("--desde", type=date.fromisoformat, default=date(2023, 1, 1), help="Primera fecha (AAAA-MM-DD)")
+    parser.add_argument(
+        "--hasta",
+        type=date.fromisoformat,
+        default=default_hasta(date.today()),
+        help="Última fecha (AAAA-MM-DD); por defecto fin del mes siguiente. "
+        "Fíjela para obtener datos reproducibles",
+    )
+    parser.add_argument(
+        "--hoy",
+        type=date.fromisoformat,
+        default=date.today(),
+        help="Fecha de generación (AAAA-MM-DD): consultas y facturas no la superan",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Flujos COPY en paralelo")
+    parser.add_argument("--truncate", action="store_true", help="Vaciar las tablas antes de cargar")
+    args = parser.parse_args()
+
+    if args.pacientes < 1:
+        parser.error("--pacientes debe ser mayor que 0")
+    if args.desde > args.hasta:
+        parser.error("--desde no puede ser posterior a --hasta")
+
+    escala = Escala.from_ratios(
+        seed=args.seed,
+        pacientes=args.pacientes,
+        citas_por_paciente=args.citas_por_paciente,
+        consultas_por_cita=args.consultas_por_cita,
+        facturas_por_consulta=args.facturas_por_consulta,
+        usuarios=args.usuarios,
+        desde=args.desde,
+        hasta=args.hasta,
+        hoy=args.hoy,
+    )
+    logger.info(f"Generando {escala}")
+    try:
+        generate(escala, max(1, args.workers), args.truncate, args.password)
+    except RuntimeError as e:
+        parser.exit(1, f"❌ {e}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from database import connect_db, disconnect_db
+from particiones import ensure_monthly_partitions, migrate_fecha_tables
+from agenda import warm_agenda
 from routers import health, auth, pacientes, citas, consultas, facturas
 from config import settings
 import logging
@@ -23,6 +25,18 @@ async def lifespan(app: FastAPI):
             logger.info("✅ Conexión a PostgreSQL establecida")
         except Exception as e:
             logger.error(f"❌ Error conectando a base de datos: {e}")
+        try:
+            await migrate_fecha_tables()
+        except Exception as e:
+            logger.error(f"❌ Error migrando cita/consulta/factura: {e}")
+        try:
+            await ensure_monthly_partitions()
+        except Exception as e:
+            logger.error(f"❌ Error creando particiones mensuales: {e}")
+        try:
+            await warm_agenda()
+        except Exception as e:
+            logger.error(f"❌ Error precargando la agenda: {e}")
     yield
     # Shutdown
     logger.info("Cerrando conexiones...")
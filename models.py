@@ -1,8 +1,15 @@
-from sqlalchemy import Column, String, Integer, Boolean, Date, Time, Text, ForeignKey, Numeric
+from sqlalchemy import Column, String, Integer, Boolean, Date, Time, Text, ForeignKey, Numeric, Index
 from sqlalchemy.orm import relationship, declarative_base
 
 Base = declarative_base()
 
+# cita, consulta y factura se particionan por rango mensual sobre `fecha`.
+# PostgreSQL exige que la clave primaria de una tabla particionada incluya la
+# columna de partición, por eso la PK es (id, fecha) y las referencias a
+# cita.id / consulta.id no se declaran como FOREIGN KEY en la base de datos.
+# Las particiones mensuales se crean con `particiones.py`.
+PARTITION_BY_FECHA = {'postgresql_partition_by': 'RANGE (fecha)'}
+
 class Paciente(Base):
     __tablename__ = 'paciente'
     cedula = Column(String(10), primary_key=True)
@@ -17,30 +24,52 @@ class Paciente(Base):
 
 class Cita(Base):
     __tablename__ = 'cita'
+    __table_args__ = (
+        Index('ix_cita_fecha_hora', 'fecha', 'hora'),
+        PARTITION_BY_FECHA,
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
-    fecha = Column(Date, nullable=False)
+    fecha = Column(Date, primary_key=True, nullable=False)
     hora = Column(Time, nullable=False)
     motivo = Column(Text)
     cedula_paciente = Column(String(10), ForeignKey('paciente.cedula'), nullable=False)
     agendada_por_medico = Column(Boolean, default=False)
 
     paciente = relationship("Paciente", back_populates="citas")
-    consultas = relationship("Consulta", back_populates="cita")
+    consultas = relationship(
+        "Consulta",
+        back_populates="cita",
+        primaryjoin="Cita.id == foreign(Consulta.cita_id)",
+    )
 
 
 class Consulta(Base):
     __tablename__ = 'consulta'
+    __table_args__ = (
+        Index('ix_consulta_fecha', 'fecha'),
+        Index('ix_consulta_paciente_fecha', 'cedula_paciente', 'fecha'),
+        PARTITION_BY_FECHA,
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
-    fecha = Column(Date, nullable=False)
+    fecha = Column(Date, primary_key=True, nullable=False)
     diagnostico = Column(Text)
     tratamiento = Column(Text)
     observaciones = Column(Text)
     cedula_paciente = Column(String(10), ForeignKey('paciente.cedula'), nullable=False)
-    cita_id = Column(Integer, ForeignKey('cita.id'))
+    cita_id = Column(Integer)
 
     paciente = relationship("Paciente", back_populates="consultas")
-    cita = relationship("Cita", back_populates="consultas")
-    factura = relationship("Factura", back_populates="consulta", uselist=False)
+    cita = relationship(
+        "Cita",
+        back_populates="consultas",
+        primaryjoin="foreign(Consulta.cita_id) == Cita.id",
+    )
+    factura = relationship(
+        "Factura",
+        back_populates="consulta",
+        uselist=False,
+        primaryjoin="Consulta.id == foreign(Factura.consulta_id)",
+    )
 
 
 class Usuario(Base):
@@ -52,12 +81,21 @@ class Usuario(Base):
 
 class Factura(Base):
     __tablename__ = 'factura'
+    __table_args__ = (
+        Index('ix_factura_fecha', 'fecha'),
+        Index('ix_factura_paciente_fecha', 'cedula_paciente', 'fecha'),
+        PARTITION_BY_FECHA,
+    )
     id = Column(Integer, primary_key=True, autoincrement=True)
-    fecha = Column(Date, nullable=False)
+    fecha = Column(Date, primary_key=True, nullable=False)
     valor = Column(Numeric(10, 2), nullable=False)
     descripcion = Column(Text)
     cedula_paciente = Column(String(10), ForeignKey('paciente.cedula'), nullable=False)
-    consulta_id = Column(Integer, ForeignKey('consulta.id'))
+    consulta_id = Column(Integer)
 
     paciente = relationship("Paciente", back_populates="facturas")
-    consulta = relationship("Consulta", back_populates="factura")
+    consulta = relationship(
+        "Consulta",
+        back_populates="factura",
+        primaryjoin="foreign(Factura.consulta_id) == Consulta.id",
+    )
@@ -0,0 +1,325 @@
+import logging
+from datetime import date
+from typing import List, Optional, Tuple
+
+from database import database
+
+logger = logging.getLogger(__name__)
+
+# Tablas particionadas por rango mensual sobre `fecha` (ver models.py)
+PARTITIONED_TABLES = ("cita", "consulta", "factura")
+
+# Índices sobre `fecha` declarados en models.py: tabla -> [(nombre, columnas)]
+FECHA_INDEXES = {
+    "cita": [("ix_cita_fecha_hora", "fecha, hora")],
+    "consulta": [
+        ("ix_consulta_fecha", "fecha"),
+        ("ix_consulta_paciente_fecha", "cedula_paciente, fecha"),
+    ],
+    "factura": [
+        ("ix_factura_fecha", "fecha"),
+        ("ix_factura_paciente_fecha", "cedula_paciente, fecha"),
+    ],
+}
+
+# Clave para que solo un proceso migre a la vez (pg_advisory_xact_lock)
+_MIGRATION_LOCK_KEY = 2026_10_18
+
+
+def month_bounds(year: int, month: int) -> Tuple[date, date]:
+    """
+    Límites [inicio, fin) de un mes, tal como los usa FOR VALUES FROM ... TO
+    """
+    inicio = date(year, month, 1)
+    fin = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return inicio, fin
+
+
+def add_months(year: int, month: int, delta: int) -> Tuple[int, int]:
+    """
+    Desplazar (año, mes) una cantidad de meses, positiva o negativa
+    """
+    total = year * 12 + (month - 1) + delta
+    return total // 12, total % 12 + 1
+
+
+def partition_name(table_name: str, year: int, month: int) -> str:
+    """
+    Nombre de la partición mensual, p. ej. cita_2025_07
+    """
+    return f"{table_name}_{year:04d}_{month:02d}"
+
+
+def monthly_partition_ddl(table_name: str, year: int, month: int) -> str:
+    """
+    Sentencia CREATE TABLE ... PARTITION OF para un mes
+    """
+    inicio, fin = month_bounds(year, month)
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table_name, year, month)} "
+        f"PARTITION OF {table_name} "
+        f"FOR VALUES FROM ('{inicio.isoformat()}') TO ('{fin.isoformat()}')"
+    )
+
+
+def fecha_index_ddl(table_name: str) -> List[str]:
+    """
+    Sentencias CREATE INDEX IF NOT EXISTS de los índices sobre `fecha` de la tabla
+    """
+    return [
+        f"CREATE INDEX IF NOT EXISTS {nombre} ON {table_name} ({columnas})"
+        for nombre, columnas in FECHA_INDEXES[table_name]
+    ]
+
+
+def months_between(desde: date, hasta: date) -> List[Tuple[int, int]]:
+    """
+    Meses (año, mes) entre dos fechas, ambos extremos inclusive
+    """
+    meses = []
+    year, month = desde.year, desde.month
+    while (year, month) <= (hasta.year, hasta.month):
+        meses.append((year, month))
+        year, month = add_months(year, month, 1)
+    return meses
+
+
+# Sin parámetros para que sirva tanto con `databases` como con asyncpg directo
+PARTITIONED_RELNAMES_QUERY = """
+SELECT c.relname FROM pg_partitioned_table pt
+JOIN pg_class c ON c.oid = pt.partrelid
+"""
+
+
+async def is_partitioned(table_name: str) -> bool:
+    """
+    Verificar si la tabla fue creada como tabla particionada
+    """
+    rows = await database.fetch_all(PARTITIONED_RELNAMES_QUERY)
+    return any(row["relname"] == table_name for row in rows)
+
+
+async def _relation_exists(nombre: str) -> bool:
+    row = await database.fetch_one("SELECT to_regclass(:nombre) AS oid", {"nombre": nombre})
+    return row is not None and row["oid"] is not None
+
+
+async def _move_from_default(table_name: str, year: int, month: int) -> None:
+    """
+    Crear la partición de un mes cuando la partición DEFAULT ya tiene filas
+    de ese mes.
+
+    PostgreSQL no permite crear la partición en ese caso, así que en una sola
+    transacción se desacopla DEFAULT, se crea el mes, se mueven sus filas y se
+    vuelve a acoplar DEFAULT.
+    """
+    inicio, fin = month_bounds(year, month)
+    default = f"{table_name}_default"
+    rango = {"inicio": inicio, "fin": fin}
+    async with database.transaction():
+        await database.execute(f"ALTER TABLE {table_name} DETACH PARTITION {default}")
+        await database.execute(monthly_partition_ddl(table_name, year, month))
+        await database.execute(
+            f"INSERT INTO {table_name} SELECT * FROM {default} "
+            f"WHERE fecha >= :inicio AND fecha < :fin",
+            rango,
+        )
+        await database.execute(
+            f"DELETE FROM {default} WHERE fecha >= :inicio AND fecha < :fin",
+            rango,
+        )
+        await database.execute(f"ALTER TABLE {table_name} ATTACH PARTITION {default} DEFAULT")
+
+
+async def create_monthly_partition(table_name: str, year: int, month: int) -> str:
+    """
+    Crear (si no existe) la partición de un mes para la tabla.
+
+    Si la partición DEFAULT ya recibió filas de ese mes, se mueven a la
+    partición nueva.
+    """
+    if table_name not in PARTITIONED_TABLES:
+        raise ValueError(f"La tabla {table_name} no está particionada")
+    nombre = partition_name(table_name, year, month)
+    try:
+        if await _relation_exists(nombre):
+            return nombre
+        default = f"{table_name}_default"
+        inicio, fin = month_bounds(year, month)
+        if await _relation_exists(default) and await database.fetch_one(
+            f"SELECT 1 FROM {default} WHERE fecha >= :inicio AND fecha < :fin LIMIT 1",
+            {"inicio": inicio, "fin": fin},
+        ):
+            logger.warning(
+                f"⚠️  {default} tiene filas de {year:04d}-{month:02d}; "
+                f"se mueven a la nueva partición {nombre}"
+            )
+            await _move_from_default(table_name, year, month)
+        else:
+            await database.execute(monthly_partition_ddl(table_name, year, month))
+        return nombre
+    except Exception as e:
+        logger.error(f"Error al crear partición {nombre}: {e}")
+        raise
+
+
+async def create_default_partition(table_name: str) -> str:
+    """
+    Crear la partición DEFAULT que recibe fechas sin partición mensual
+    """
+    if table_name not in PARTITIONED_TABLES:
+        raise ValueError(f"La tabla {table_name} no está particionada")
+    nombre = f"{table_name}_default"
+    try:
+        await database.execute(
+            f"CREATE TABLE IF NOT EXISTS {nombre} PARTITION OF {table_name} DEFAULT"
+        )
+        return nombre
+    except Exception as e:
+        logger.error(f"Error al crear partición {nombre}: {e}")
+        raise
+
+
+async def ensure_monthly_partitions(
+    meses_atras: int = 1,
+    meses_adelante: int = 12,
+    hoy: Optional[date] = None,
+) -> List[str]:
+    """
+    Asegurar particiones mensuales alrededor de la fecha actual.
+
+    Las tablas que no están particionadas se omiten (ver migrate_fecha_tables).
+    Un error en una partición se registra y no impide crear las demás.
+    """
+    hoy = hoy or date.today()
+    creadas: List[str] = []
+    for table_name in PARTITIONED_TABLES:
+        try:
+            if not await is_partitioned(table_name):
+                logger.info(f"La tabla {table_name} no está particionada, se omite")
+                continue
+        except Exception as e:
+            logger.error(f"Error al verificar particionado de {table_name}: {e}")
+            continue
+        for delta in range(-meses_atras, meses_adelante + 1):
+            year, month = add_months(hoy.year, hoy.month, delta)
+            try:
+                creadas.append(await create_monthly_partition(table_name, year, month))
+            except Exception:
+                # create_monthly_partition ya registró el error
+                continue
+        try:
+            creadas.append(await create_default_partition(table_name))
+        except Exception:
+            continue
+    return creadas
+
+
+async def _drop_foreign_keys_to_partitioned() -> None:
+    """
+    Eliminar las FOREIGN KEY que apuntan a cita/consulta/factura.
+
+    Tras particionar, cita.id y consulta.id dejan de ser únicos por sí solos
+    (la PK es (id, fecha)), por lo que esas referencias no pueden mantenerse.
+    """
+    query = """
+    SELECT con.conname, rel.relname
+    FROM pg_constraint con
+    JOIN pg_class rel ON rel.oid = con.conrelid
+    JOIN pg_class ref ON ref.oid = con.confrelid
+    WHERE con.contype = 'f' AND ref.relname IN ('cita', 'consulta', 'factura')
+    """
+    for row in await database.fetch_all(query):
+        logger.info(f"Eliminando FOREIGN KEY {row['conname']} de {row['relname']}")
+        await database.execute(f"ALTER TABLE {row['relname']} DROP CONSTRAINT {row['conname']}")
+
+
+async def _convert_to_partitioned(table_name: str) -> None:
+    """
+    Convertir una tabla normal en tabla particionada por mes sobre `fecha`.
+
+    En una sola transacción: se renombra la tabla original, se crea la tabla
+    particionada con las mismas columnas, se crean particiones para todos los
+    meses con datos, se copian las filas y se elimina la original.
+    """
+    anterior = f"{table_name}_sin_particionar"
+    async with database.transaction():
+        await database.execute(f"SELECT pg_advisory_xact_lock({_MIGRATION_LOCK_KEY})")
+        # Otro proceso pudo haber migrado mientras se esperaba el lock
+        if not await _relation_exists(table_name) or await is_partitioned(table_name):
+            return
+        await _drop_foreign_keys_to_partitioned()
+        rango = await database.fetch_one(
+            f"SELECT MIN(fecha) AS desde, MAX(fecha) AS hasta FROM {table_name}"
+        )
+        secuencia = await database.fetch_one(
+            f"SELECT pg_get_serial_sequence('{table_name}', 'id') AS nombre"
+        )
+        await database.execute(f"ALTER TABLE {table_name} RENAME TO {anterior}")
+        await database.execute(
+            f"CREATE TABLE {table_name} (LIKE {anterior} INCLUDING DEFAULTS) "
+            f"PARTITION BY RANGE (fecha)"
+        )
+        if rango["desde"] is not None:
+            for year, month in months_between(rango["desde"], rango["hasta"]):
+                await database.execute(monthly_partition_ddl(table_name, year, month))
+        await database.execute(
+            f"CREATE TABLE IF NOT EXISTS {table_name}_default PARTITION OF {table_name} DEFAULT"
+        )
+        await database.execute(f"INSERT INTO {table_name} SELECT * FROM {anterior}")
+        # La secuencia SERIAL pertenece a la tabla original; pasarla a la nueva
+        if secuencia and secuencia["nombre"]:
+            await database.execute(f"ALTER SEQUENCE {secuencia['nombre']} OWNED BY NONE")
+        await database.execute(f"DROP TABLE {anterior}")
+        if secuencia and secuencia["nombre"]:
+            await database.execute(
+                f"ALTER SEQUENCE {secuencia['nombre']} OWNED BY {table_name}.id"
+            )
+        await database.execute(f"ALTER TABLE {table_name} ADD PRIMARY KEY (id, fecha)")
+        await database.execute(
+            f"ALTER TABLE {table_name} ADD FOREIGN KEY (cedula_paciente) "
+            f"REFERENCES paciente (cedula)"
+        )
+    logger.info(f"✅ Tabla {table_name} convertida a tabla particionada por fecha")
+
+
+async def migrate_fecha_tables() -> None:
+    """
+    Llevar una base existente al esquema de models.py para cita/consulta/factura:
+    convertirlas en tablas particionadas por mes (cubriendo toda la historia)
+    y crear los índices sobre `fecha`.
+
+    Es idempotente; un error en una tabla se registra y no impide migrar las demás.
+    """
+    for table_name in PARTITIONED_TABLES:
+        try:
+            if not await _relation_exists(table_name):
+                logger.warning(f"⚠️  La tabla {table_name} no existe, se omite la migración")
+                continue
+            if not await is_partitioned(table_name):
+                await _convert_to_partitioned(table_name)
+        except Exception as e:
+            logger.error(f"❌ Error al particionar {table_name}: {e}")
+        try:
+            for ddl in fecha_index_ddl(table_name):
+                await database.execute(ddl)
+        except Exception as e:
+            logger.error(f"❌ Error al crear índices de {table_name}: {e}")
+
+
+async def detach_partition(table_name: str, year: int, month: int) -> str:
+    """
+    Desacoplar la partición de un mes para archivarla.
+
+    La tabla desacoplada queda como tabla normal y puede exportarse o
+    eliminarse sin tocar (ni hacer VACUUM de) la tabla principal.
+    """
+    if table_name not in PARTITIONED_TABLES:
+        raise ValueError(f"La tabla {table_name} no está particionada")
+    nombre = partition_name(table_name, year, month)
+    try:
+        await database.execute(f"ALTER TABLE {table_name} DETACH PARTITION {nombre}")
+        return nombre
+    except Exception as e:
+        logger.error(f"Error al desacoplar partición {nombre}: {e}")
+        raise
@@ -1,8 +1,12 @@
-from typing import List
-from fastapi import APIRouter, HTTPException, Depends
-from schemas.citas import CitaReserve, Cita
-from database import delete_record, get_all_from_table, get_by_id, insert_into_table
-from utils import get_current_user
+from datetime import date
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Depends, Query
+from schemas.citas import CitaReserve, Cita, AgendaCita
+from database import delete_record, get_by_date_range, get_by_id, insert_into_table
+from fieldsets import sparse_fields, sparse_response
+from agenda import agenda_add, agenda_remove, get_agenda
+from utils import get_current_user, validate_date_range
+import models
 
 router = APIRouter(
     prefix="/citas",
@@ -16,7 +20,7 @@ async def reservar_cita(payload: CitaReserve):
     paciente = await get_by_id("paciente", "cedula", payload.cedula)
     if not paciente:
         # Crear paciente si no existe
-        await insert_into_table("paciente", {
+        paciente = await insert_into_table("paciente", {
             "cedula": payload.cedula,
             "nombres": payload.nombres,
             "correo": payload.correo,
@@ -29,6 +33,7 @@ async def reservar_cita(payload: CitaReserve):
         "motivo": payload.motivo,
         "cedula_paciente": payload.cedula,
     })
+    agenda_add(cita, paciente)
     return cita
 
 @router.post("/", response_model=Cita)
@@ -39,7 +44,7 @@ async def agendar_cita(
     # Autorizado por médico: marcar agendada_por_medico=True
     paciente = await get_by_id("paciente", "cedula", payload.cedula)
     if not paciente:
-        await insert_into_table("paciente", {
+        paciente = await insert_into_table("paciente", {
             "cedula": payload.cedula,
             "nombres": payload.nombres,
             "correo": payload.correo,
@@ -52,13 +57,28 @@ async def agendar_cita(
         "cedula_paciente": payload.cedula,
         "agendada_por_medico": True,
     })
+    agenda_add(cita, paciente)
     return cita
 
 @router.get("/", response_model=List[Cita])
 async def get_citas(
+    desde: Optional[date] = Query(None, description="Fecha inicial (inclusive)"),
+    hasta: Optional[date] = Query(None, description="Fecha final (inclusive)"),
+    fields: Optional[List[str]] = Depends(sparse_fields(models.Cita, Cita)),
     current_user: dict = Depends(get_current_user),
 ):
-    return await get_all_from_table("cita")
+    validate_date_range(desde, hasta)
+    citas = await get_by_date_range("cita", desde, hasta, order_by="fecha, hora", columns=fields)
+    if fields:
+        return sparse_response(citas, Cita, fields)
+    return citas
+
+@router.get("/agenda", response_model=List[AgendaCita])
+async def get_agenda_dia(
+    fecha: Optional[date] = Query(None, description="Día de la agenda (por defecto hoy)"),
+    current_user: dict = Depends(get_current_user),
+):
+    return await get_agenda(fecha or date.today())
 
 @router.delete("/{id}")
 async def delete_cita(
@@ -66,4 +86,5 @@ async def delete_cita(
     current_user: dict = Depends(get_current_user),
 ):
     success = await delete_record("cita", "id", id)
+    agenda_remove(id)
     return {"deleted": success}
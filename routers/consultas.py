@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import date
+from typing import List, Optional
 from schemas.consultas import Consulta, ConsultaCreate
 from database import insert_into_table, get_consultas_by_paciente
-from utils import get_current_user
+from fieldsets import sparse_fields, sparse_response
+from utils import get_current_user, validate_date_range
+import models
 
 router = APIRouter(
     prefix="/consultas",
@@ -18,8 +21,17 @@ async def create_consulta(payload: ConsultaCreate, current_user: dict = Depends(
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{cedula}", response_model=List[Consulta])
-async def get_consultas(cedula: str, current_user: dict = Depends(get_current_user)):
-    consultas = await get_consultas_by_paciente(cedula)
+async def get_consultas(
+    cedula: str,
+    desde: Optional[date] = Query(None, description="Fecha inicial (inclusive)"),
+    hasta: Optional[date] = Query(None, description="Fecha final (inclusive)"),
+    fields: Optional[List[str]] = Depends(sparse_fields(models.Consulta, Consulta)),
+    current_user: dict = Depends(get_current_user),
+):
+    validate_date_range(desde, hasta)
+    consultas = await get_consultas_by_paciente(cedula, desde, hasta, columns=fields)
     if not consultas:
         raise HTTPException(status_code=404, detail="No se encontraron consultas para el paciente")
+    if fields:
+        return sparse_response(consultas, Consulta, fields)
     return consultas
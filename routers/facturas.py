@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import date
+from typing import List, Optional
 from schemas.facturas import Factura, FacturaCreate
-from database import insert_into_table, get_all_from_table, get_facturas_by_paciente
-from utils import get_current_user
+from database import insert_into_table, get_by_date_range, get_facturas_by_paciente
+from fieldsets import sparse_fields, sparse_response
+from utils import get_current_user, validate_date_range
+import models
 
 router = APIRouter(
     prefix="/facturas",
@@ -18,12 +21,30 @@ async def create_factura(payload: FacturaCreate, current_user: dict = Depends(ge
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/", response_model=List[Factura])
-async def get_facturas(current_user: dict = Depends(get_current_user)):
-    return await get_all_from_table("factura")
+async def get_facturas(
+    desde: Optional[date] = Query(None, description="Fecha inicial (inclusive)"),
+    hasta: Optional[date] = Query(None, description="Fecha final (inclusive)"),
+    fields: Optional[List[str]] = Depends(sparse_fields(models.Factura, Factura)),
+    current_user: dict = Depends(get_current_user),
+):
+    validate_date_range(desde, hasta)
+    facturas = await get_by_date_range("factura", desde, hasta, columns=fields)
+    if fields:
+        return sparse_response(facturas, Factura, fields)
+    return facturas
 
 @router.get("/{cedula}", response_model=List[Factura])
-async def get_facturas_paciente(cedula: str, current_user: dict = Depends(get_current_user)):
-    facturas = await get_facturas_by_paciente(cedula)
+async def get_facturas_paciente(
+    cedula: str,
+    desde: Optional[date] = Query(None, description="Fecha inicial (inclusive)"),
+    hasta: Optional[date] = Query(None, description="Fecha final (inclusive)"),
+    fields: Optional[List[str]] = Depends(sparse_fields(models.Factura, Factura)),
+    current_user: dict = Depends(get_current_user),
+):
+    validate_date_range(desde, hasta)
+    facturas = await get_facturas_by_paciente(cedula, desde, hasta, columns=fields)
     if not facturas:
         raise HTTPException(status_code=404, detail="No se encontraron facturas para el paciente")
+    if fields:
+        return sparse_response(facturas, Factura, fields)
     return facturas
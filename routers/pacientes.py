@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from typing import List, Optional
 from schemas.paciente import Paciente, PacienteCreate
 from database import get_by_id, get_all_from_table, insert_into_table
+from fieldsets import sparse_fields, sparse_response
+import models
 
 router = APIRouter(
     prefix="/pacientes",
@@ -17,12 +19,22 @@ async def create_paciente(payload: PacienteCreate):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{cedula}", response_model=Paciente)
-async def get_paciente(cedula: str):
-    paciente = await get_by_id("paciente", "cedula", cedula)
+async def get_paciente(
+    cedula: str,
+    fields: Optional[List[str]] = Depends(sparse_fields(models.Paciente, Paciente)),
+):
+    paciente = await get_by_id("paciente", "cedula", cedula, columns=fields)
     if not paciente:
         raise HTTPException(status_code=4.4, detail="Paciente no encontrado")
+    if fields:
+        return sparse_response(paciente, Paciente, fields)
     return paciente
 
 @router.get("/", response_model=List[Paciente])
-async def get_pacientes():
-    return await get_all_from_table("paciente")
+async def get_pacientes(
+    fields: Optional[List[str]] = Depends(sparse_fields(models.Paciente, Paciente)),
+):
+    pacientes = await get_all_from_table("paciente", columns=fields)
+    if fields:
+        return sparse_response(pacientes, Paciente, fields)
+    return pacientes
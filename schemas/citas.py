@@ -21,3 +21,7 @@ class Cita(BaseModel):
 
     class Config:
         from_attributes = True
+
+class AgendaCita(Cita):
+    nombres: str
+    telefono: Optional[str] = None
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# config.py lee DB_PORT como entero al importarse
+os.environ.setdefault("DB_PORT", "5432")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,97 @@
+import asyncio
+from datetime import date, time
+
+import pytest
+
+import agenda
+
+FECHA = date(2026, 10, 19)
+
+
+@pytest.fixture(autouse=True)
+def agenda_vacia(monkeypatch):
+    monkeypatch.setattr(agenda, "_agenda_cache", agenda.OrderedDict())
+    monkeypatch.setattr(agenda, "_versions", {})
+    monkeypatch.setattr(agenda, "_loading", {})
+
+
+def _cita(cita_id: int, hora: time) -> dict:
+    return {
+        "id": cita_id,
+        "fecha": FECHA,
+        "hora": hora,
+        "motivo": None,
+        "cedula_paciente": "0100000009",
+        "agendada_por_medico": False,
+    }
+
+
+def _fake_db(monkeypatch, filas: list):
+    async def get_agenda_by_fecha(fecha):
+        return [dict(fila) for fila in filas if fila["fecha"] == fecha]
+
+    monkeypatch.setattr(agenda, "get_agenda_by_fecha", get_agenda_by_fecha)
+
+
+def test_add_inserta_en_orden_de_hora(monkeypatch):
+    _fake_db(monkeypatch, [{**_cita(1, time(10)), "nombres": "Ana", "telefono": None}])
+    asyncio.run(agenda.load_agenda(FECHA))
+
+    agenda.agenda_add(_cita(2, time(9)), {"nombres": "Luis", "telefono": "0999999999"})
+
+    citas = asyncio.run(agenda.get_agenda(FECHA))
+    assert [c["id"] for c in citas] == [2, 1]
+    assert citas[0]["nombres"] == "Luis"
+
+
+def test_add_despues_de_recarga_no_duplica(monkeypatch):
+    # La cita ya está en la base de datos cuando una recarga del mismo día
+    # termina antes de que reservar_cita/agendar_cita llame a agenda_add.
+    nueva = _cita(2, time(11))
+    _fake_db(monkeypatch, [
+        {**_cita(1, time(10)), "nombres": "Ana", "telefono": None},
+        {**nueva, "nombres": "Luis", "telefono": None},
+    ])
+    asyncio.run(agenda.load_agenda(FECHA))
+
+    agenda.agenda_add(nueva, {"nombres": "Luis", "telefono": None})
+
+    citas = asyncio.run(agenda.get_agenda(FECHA))
+    assert [c["id"] for c in citas] == [1, 2]
+
+
+def test_remove_quita_la_cita(monkeypatch):
+    _fake_db(monkeypatch, [{**_cita(1, time(10)), "nombres": "Ana", "telefono": None}])
+    asyncio.run(agenda.load_agenda(FECHA))
+
+    agenda.agenda_remove(1)
+
+    assert asyncio.run(agenda.get_agenda(FECHA)) == []
+
+
+def _load_con_escritura(monkeypatch, escritura):
+    """Cargar FECHA ejecutando `escritura` mientras la consulta está en curso"""
+    async def get_agenda_by_fecha(fecha):
+        escritura()
+        await asyncio.sleep(0)
+        return [{**_cita(1, time(10)), "nombres": "Ana", "telefono": None}]
+
+    monkeypatch.setattr(agenda, "get_agenda_by_fecha", get_agenda_by_fecha)
+    asyncio.run(agenda.load_agenda(FECHA))
+
+
+def test_escritura_de_otro_dia_no_descarta_la_carga(monkeypatch):
+    otro_dia = {**_cita(5, time(8)), "fecha": date(2026, 10, 20)}
+    _load_con_escritura(monkeypatch, lambda: agenda.agenda_add(otro_dia, {"nombres": "Luis"}))
+    assert FECHA in agenda._agenda_cache
+
+
+def test_escritura_del_mismo_dia_descarta_la_carga(monkeypatch):
+    _load_con_escritura(monkeypatch, lambda: agenda.agenda_add(_cita(5, time(8)), {"nombres": "Luis"}))
+    assert FECHA not in agenda._agenda_cache
+
+
+def test_eliminacion_fuera_de_cache_descarta_cargas_en_curso(monkeypatch):
+    _load_con_escritura(monkeypatch, lambda: agenda.agenda_remove(1))
+    assert FECHA not in agenda._agenda_cache
+    assert agenda._loading == {}
@@ -0,0 +1,74 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import models
+from fieldsets import sparse_fields, trimmed_schema
+from routers import pacientes
+from schemas.consultas import Consulta
+from schemas.paciente import Paciente
+
+PACIENTE = {
+    "cedula": "0100000009",
+    "nombres": "Ana Torres Vega",
+    "correo": "ana@gmail.com",
+    "telefono": "0999999999",
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    llamadas = []
+
+    async def get_all_from_table(table_name, limit=None, offset=None, columns=None):
+        llamadas.append(columns)
+        return [{k: PACIENTE[k] for k in (columns or PACIENTE)}]
+
+    async def get_by_id(table_name, id_field, id_value, columns=None):
+        llamadas.append(columns)
+        return {k: PACIENTE[k] for k in (columns or PACIENTE)}
+
+    monkeypatch.setattr(pacientes, "get_all_from_table", get_all_from_table)
+    monkeypatch.setattr(pacientes, "get_by_id", get_by_id)
+    app = FastAPI()
+    app.include_router(pacientes.router)
+    client = TestClient(app)
+    client.llamadas = llamadas
+    return client
+
+
+@pytest.mark.parametrize(
+    "fields",
+    ["id;drop", "cedula,nombres;DROP TABLE paciente", "password_hash", "nope", "", " , ,"],
+)
+def test_campos_invalidos_o_vacios_responden_400(client, fields):
+    response = client.get("/pacientes/", params={"fields": fields})
+    assert response.status_code == 400
+    assert client.llamadas == []
+
+
+def test_duplicados_y_espacios_se_normalizan(client):
+    response = client.get("/pacientes/", params={"fields": " telefono , cedula,telefono "})
+    assert response.status_code == 200
+    assert client.llamadas == [["cedula", "telefono"]]
+    assert response.json() == [{"cedula": PACIENTE["cedula"], "telefono": PACIENTE["telefono"]}]
+
+
+def test_detalle_solo_devuelve_campos_pedidos(client):
+    response = client.get(f"/pacientes/{PACIENTE['cedula']}", params={"fields": "nombres"})
+    assert response.status_code == 200
+    assert response.json() == {"nombres": PACIENTE["nombres"]}
+
+
+def test_sin_fields_devuelve_modelo_completo(client):
+    assert client.get("/pacientes/").json() == [PACIENTE]
+    assert client.get(f"/pacientes/{PACIENTE['cedula']}").json() == PACIENTE
+    assert client.llamadas == [None, None]
+
+
+def test_permutaciones_comparten_esquema():
+    dependency = sparse_fields(models.Consulta, Consulta)
+    a = dependency("tratamiento,fecha,id")
+    b = dependency("id,tratamiento,fecha")
+    assert a == b == ["id", "fecha", "tratamiento"]
+    assert trimmed_schema(Consulta, tuple(a)) is trimmed_schema(Consulta, tuple(b))
@@ -0,0 +1,109 @@
+from datetime import date
+
+import pytest
+
+import generar_datos as g
+
+HOY = date(2026, 10, 18)
+
+
+@pytest.fixture
+def escala():
+    return g.Escala.from_ratios(
+        seed=42,
+        pacientes=500,
+        citas_por_paciente=4,
+        consultas_por_cita=0.7,
+        facturas_por_consulta=0.9,
+        usuarios=5,
+        desde=date(2025, 1, 1),
+        hasta=date(2026, 11, 30),
+        hoy=HOY,
+    )
+
+
+def _verificador_valido(cedula: str) -> bool:
+    total = 0
+    for i, coeficiente in enumerate([2, 1, 2, 1, 2, 1, 2, 1, 2]):
+        valor = int(cedula[i]) * coeficiente
+        total += valor - 9 if valor > 9 else valor
+    return (10 - total % 10) % 10 == int(cedula[9])
+
+
+def test_cedula_valida_y_unica():
+    cedulas = [g.cedula_for(i) for i in range(1, 50_001)]
+    assert len(set(cedulas)) == len(cedulas)
+    for cedula in cedulas:
+        assert len(cedula) == 10 and cedula.isdigit()
+        assert 1 <= int(cedula[:2]) <= 24
+        assert int(cedula[2]) < 6
+        assert _verificador_valido(cedula)
+
+
+@pytest.mark.parametrize("total, workers", [(1, 4), (10, 3), (4000, 4), (4001, 16), (7, 7)])
+def test_shards_cubren_sin_huecos_ni_solapes(total, workers):
+    ids = [i for start, end in g._shards(total, workers) for i in range(start, end)]
+    assert ids == list(range(1, total + 1))
+
+
+@pytest.mark.parametrize("table_name", ["paciente", "cita", "consulta", "factura"])
+def test_mismas_filas_con_distinto_numero_de_workers(escala, table_name):
+    totales = {
+        "paciente": escala.pacientes,
+        "cita": escala.citas,
+        "consulta": escala.consultas,
+        "factura": escala.facturas,
+    }
+    total = totales[table_name]
+
+    def cargar(workers):
+        return [
+            row
+            for start, end in g._shards(total, workers)
+            for row in g._rows(escala, table_name, start, end)
+        ]
+
+    assert cargar(1) == cargar(7)
+
+
+def test_misma_semilla_mismas_filas(escala):
+    otra = g.Escala.from_ratios(42, 500, 4, 0.7, 0.9, 5, date(2025, 1, 1), date(2026, 11, 30), HOY)
+    assert [g.cita_row(escala, i) for i in range(1, 100)] == [g.cita_row(otra, i) for i in range(1, 100)]
+
+
+def test_consulta_referencia_su_cita(escala):
+    cita_ids = set()
+    for consulta_id in range(1, escala.consultas + 1):
+        _, fecha, _, _, _, cedula, cita_id = g.consulta_row(escala, consulta_id)
+        assert 1 <= cita_id <= escala.citas
+        _, cita_fecha, _, _, cita_cedula, _ = g.cita_row(escala, cita_id)
+        assert (fecha, cedula) == (cita_fecha, cita_cedula)
+        cita_ids.add(cita_id)
+    assert len(cita_ids) == escala.consultas
+
+
+def test_factura_referencia_su_consulta(escala):
+    consulta_ids = set()
+    for factura_id in range(1, escala.facturas + 1):
+        _, fecha, _, _, cedula, consulta_id = g.factura_row(escala, factura_id)
+        _, consulta_fecha, _, _, _, consulta_cedula, _ = g.consulta_row(escala, consulta_id)
+        assert (fecha, cedula) == (consulta_fecha, consulta_cedula)
+        consulta_ids.add(consulta_id)
+    assert len(consulta_ids) == escala.facturas
+
+
+def test_cedula_paciente_existe(escala):
+    cedulas = {g.paciente_row(escala, i)[0] for i in range(1, escala.pacientes + 1)}
+    assert all(g.cita_row(escala, i)[4] in cedulas for i in range(1, escala.citas + 1))
+
+
+def test_consultas_y_facturas_no_quedan_en_el_futuro(escala):
+    assert all(g.consulta_row(escala, i)[1] <= HOY for i in range(1, escala.consultas + 1))
+    assert all(g.factura_row(escala, i)[1] <= HOY for i in range(1, escala.facturas + 1))
+    # Las citas sin consulta sí pueden ser futuras
+    assert any(g.cita_row(escala, i)[1] > HOY for i in range(1, escala.citas + 1))
+
+
+def test_sin_consultas_si_todo_es_futuro():
+    escala = g.Escala.from_ratios(1, 10, 4, 0.7, 0.9, 1, date(2027, 1, 1), date(2027, 3, 31), HOY)
+    assert escala.consultas == 0 and escala.facturas == 0
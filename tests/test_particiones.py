@@ -0,0 +1,93 @@
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from database import _fecha_conditions
+from particiones import (
+    add_months,
+    fecha_index_ddl,
+    month_bounds,
+    monthly_partition_ddl,
+    months_between,
+)
+from utils import validate_date_range
+
+
+def test_month_bounds_diciembre_cruza_de_anio():
+    assert month_bounds(2025, 12) == (date(2025, 12, 1), date(2026, 1, 1))
+
+
+def test_month_bounds_mes_normal():
+    assert month_bounds(2024, 2) == (date(2024, 2, 1), date(2024, 3, 1))
+
+
+@pytest.mark.parametrize(
+    "year, month, delta, esperado",
+    [
+        (2025, 12, 1, (2026, 1)),
+        (2026, 1, -1, (2025, 12)),
+        (2026, 1, -13, (2024, 12)),
+        (2025, 6, 0, (2025, 6)),
+        (2025, 6, 18, (2026, 12)),
+    ],
+)
+def test_add_months(year, month, delta, esperado):
+    assert add_months(year, month, delta) == esperado
+
+
+def test_months_between_incluye_ambos_extremos():
+    assert months_between(date(2025, 11, 15), date(2026, 2, 1)) == [
+        (2025, 11), (2025, 12), (2026, 1), (2026, 2),
+    ]
+
+
+def test_monthly_partition_ddl():
+    assert monthly_partition_ddl("cita", 2025, 12) == (
+        "CREATE TABLE IF NOT EXISTS cita_2025_12 PARTITION OF cita "
+        "FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')"
+    )
+
+
+def test_fecha_index_ddl():
+    assert fecha_index_ddl("factura") == [
+        "CREATE INDEX IF NOT EXISTS ix_factura_fecha ON factura (fecha)",
+        "CREATE INDEX IF NOT EXISTS ix_factura_paciente_fecha ON factura (cedula_paciente, fecha)",
+    ]
+
+
+def test_fecha_conditions_sin_rango():
+    params = {}
+    assert _fecha_conditions(None, None, params) == []
+    assert params == {}
+
+
+def test_fecha_conditions_con_rango():
+    params = {"cedula_paciente": "0100000009"}
+    conditions = _fecha_conditions(date(2025, 1, 1), date(2025, 1, 31), params)
+    assert conditions == ["fecha >= :desde", "fecha <= :hasta"]
+    assert params == {
+        "cedula_paciente": "0100000009",
+        "desde": date(2025, 1, 1),
+        "hasta": date(2025, 1, 31),
+    }
+
+
+def test_fecha_conditions_solo_hasta():
+    params = {}
+    assert _fecha_conditions(None, date(2025, 1, 31), params) == ["fecha <= :hasta"]
+    assert params == {"hasta": date(2025, 1, 31)}
+
+
+def test_validate_date_range_invertido():
+    with pytest.raises(HTTPException) as exc:
+        validate_date_range(date(2025, 2, 1), date(2025, 1, 1))
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "desde, hasta",
+    [(None, None), (date(2025, 1, 1), None), (None, date(2025, 1, 1)), (date(2025, 1, 1), date(2025, 1, 1))],
+)
+def test_validate_date_range_valido(desde, hasta):
+    validate_date_range(desde, hasta)
@@ -4,7 +4,7 @@ from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from database import get_db, database
 from passlib.context import CryptContext
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -52,3 +52,9 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db = Depends(get
     if user is None:
         raise credentials_exception
     return dict(user)
+
+
+def validate_date_range(desde: Optional[date], hasta: Optional[date]) -> None:
+    """Validar que el rango de fechas desde/hasta sea coherente"""
+    if desde is not None and hasta is not None and desde > hasta:
+        raise HTTPException(status_code=400, detail="'desde' no puede ser posterior a 'hasta'")